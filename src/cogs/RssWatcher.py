@@ -4,29 +4,141 @@ RssWatcher,
 Watches RSS feeds for new episodes then posts a discord message/thread/post.
 """
 
+import asyncio
+import hashlib
+import re
 import traceback
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from typing import Any
 
+import aiohttp
 import feedparser
+import html2text
 from discord import Bot, ChannelType, Color, Embed, ForumChannel, TextChannel, Thread
 from discord.ext import commands, tasks
-from markdownify import markdownify as md
-from pydantic import BaseModel
 
+from threadslapper.__about__ import __version__
 from threadslapper.settings import RssFeedToChannel, Settings
 
 settings = Settings()
 log = settings.create_logger('RssWatcher')
 
+REQUEST_HEADERS = {'User-Agent': f'threadslapper/{__version__}'}
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+# the first paragraph of an HTML description ends at a closing paragraph tag or a double line break
+FIRST_PARAGRAPH_END = re.compile(r'</p>|<br\s*/?>\s*<br', re.IGNORECASE)
+
+
+@lru_cache(maxsize=64)
+def md(html: str) -> str:
+    """
+    Converts an HTML formatted document to markdown. A new converter is
+    needed per call as html2text keeps parser state on the instance.
+    """
+    converter = html2text.HTML2Text()
+    converter.body_width = 0
+    return converter.handle(html)
+
+
+@lru_cache(maxsize=64)
+def md_summary(html: str) -> str:
+    """
+    Converts the first paragraph of an HTML formatted document to markdown,
+    the HTML is cut before converting so the rest of it is never parsed.
+    """
+    if (match := FIRST_PARAGRAPH_END.search(html)) is not None:
+        html = html[: match.start()]
+    return md(html).partition("\n\n")[0].strip()
+
+
+# opening tag of an RSS item or an Atom entry
+FEED_ENTRY_TAG = re.compile(rb'<(item|entry)[\s/>]')
+FEED_CLOSING_TAGS = {b'item': b'</channel></rss>', b'entry': b'</feed>'}
+
+
+def trim_to_first_entry(raw: bytes) -> bytes:
+    """
+    Cuts a feed document off right before its second item/entry, closing
+    tags are appended so the remaining document is still well formed.
+    """
+    entries = FEED_ENTRY_TAG.finditer(raw)
+    if (first := next(entries, None)) is None or (second := next(entries, None)) is None:
+        return raw
+    return raw[: second.start()] + FEED_CLOSING_TAGS[first.group(1)]
+
+
+def parse_feed(raw: bytes, first_entry_only: bool = False, headers: dict[str, str] | None = None) -> dict[str, Any]:
+    """
+    Parses a feed document. The HTML is only ever converted to markdown for
+    discord, so feedparser's sanitizer and relative URI resolution are skipped.
+    The response headers let feedparser pick up the declared encoding.
+
+    If first_entry_only=true, everything after the first item/entry is dropped
+    before parsing, falling back to the full document if that yields no entries.
+    """
+    options: dict[str, Any] = dict(response_headers=headers, sanitize_html=False, resolve_relative_uris=False)
+    if first_entry_only:
+        data = dict(feedparser.parse(trim_to_first_entry(raw), **options))
+        if data.get('entries'):
+            return data
+    return dict(feedparser.parse(raw, **options))
+
+
+@lru_cache(maxsize=1024)
+def parse_timestamp(timestamp: str) -> datetime | None:
+    """
+    Attempt to convert a published date to a datetime object, returns None
+    if the format is not recognised. RSS uses RFC 2822 dates, Atom uses ISO 8601.
+    """
+    try:
+        return parsedate_to_datetime(timestamp)
+    except (TypeError, ValueError):
+        pass
+    try:
+        # fromisoformat only accepts a `Z` suffix from python 3.11 on
+        if timestamp.endswith(('Z', 'z')):
+            timestamp = timestamp[:-1] + '+00:00'
+        return datetime.fromisoformat(timestamp)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=256)
+def format_title(title: str, number: int, prefix: str = "", override_ep_number: bool = False) -> str:
+    """
+    Builds an episode title, memoised as the same title is needed for the
+    thread, the embeds and the announcement of an episode.
+    """
+    if override_ep_number:
+        return title
+    if not title.startswith(str(number)):
+        title = f"{number}: {title}"
+    return f"{prefix} {title}" if prefix else title
+
 
-class ChannelData(BaseModel):
+def index_threads(channel: TextChannel | ForumChannel, indexes: dict[int, dict[str, Thread]]) -> dict[str, Thread]:
+    """
+    Maps the channel's thread names to threads, so lookups by title do not rescan
+    the channel. The index is built once per channel id and kept in `indexes`.
+    """
+    if (index := indexes.get(channel.id)) is None:
+        index = indexes[channel.id] = {thread.name: thread for thread in channel.threads}
+    return index
+
+
+@dataclass(slots=True, frozen=True)
+class ChannelData:
     channel_title: str
     channel_url: str
     channel_image_url: str
     channel_last_published: str
 
 
+@dataclass(slots=True, frozen=True)
 class EpisodeData(ChannelData):
     number: int
     title: str
@@ -41,11 +153,7 @@ class EpisodeData(ChannelData):
 
         If truncate=true, it will cut the description at the first double line-return.
         """
-        desc = md(self.description)
-
-        if truncate:
-            first_line_break = desc.index("\n\n")
-            return desc[:first_line_break]
+        desc = md_summary(self.description) if truncate else md(self.description)
         if len(desc) > 2000:
             desc = f"{desc[:1997]}..."
 
@@ -57,38 +165,57 @@ class EpisodeData(ChannelData):
         if the title of the episode does not contain an episode number, prepend
         the episode number in the RSS feed to the episode title.
         """
-        if override_ep_number:
-            return self.title.strip()
-        if self.title.startswith(f"{self.number}"):
-            return f"{prefix} {self.title}".strip()
-        return f"{prefix} {self.number}: {self.title}".strip()
+        return format_title(self.title, self.number, prefix, override_ep_number)
 
     def get_timestamp(self) -> datetime:
         """
         Attempt to convert a time format to a datetime object.
         """
-        observed_datetime_formats = ["%a, %d %b %Y %H:%M:%S %z", "%a, %d %b %Y %H:%M:%S %Z"]
-        for dt_fmt in observed_datetime_formats:
-            try:
-                dt = datetime.strptime(self.channel_last_published, dt_fmt)
-                return dt
-            except:
-                pass
-        return datetime.now()
+        return parse_timestamp(self.channel_last_published) or datetime.now(timezone.utc)
 
 
 class RssWatcher(commands.Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
         self.feeds = settings.get_channels_list()
+        self._session: aiohttp.ClientSession | None = None
+        # set when the startup check fails, the bot is closed and this is raised once bot.run returns
+        self.startup_error: Exception | None = None
+        # colors are fixed per feed, build them once rather than per embed
+        self._embed_colors: dict[str, Color] = {
+            feed.title: Color.from_rgb(*feed.get_color_theme()) for feed in self.feeds
+        }
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the shared HTTP session, it is created lazily as aiohttp
+        expects to be instantiated inside the running event loop.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(headers=REQUEST_HEADERS, timeout=REQUEST_TIMEOUT)
+        return self._session
 
-        log.info(f'Beginning first time check of RSS feed... {", ".join([feed.title for feed in self.feeds])}')
+    async def startup_check(self):
+        """Record the latest episode of every feed so only newer episodes are posted"""
+        log.info('Beginning first time check of RSS feed... %s', ", ".join([feed.title for feed in self.feeds]))
         if settings.startup_latest_episode_check:
-            for feed in self.feeds:
-                if (latest_episode := self.check_rss(rss=feed)) is not None:
-                    log.info(f'{feed.title}: Latest episode checked on bot power on: {latest_episode.number}.')
+            # all feeds are fetched at once, startup takes as long as the slowest feed
+            # one failing feed does not cancel the others, every failure is logged before giving up
+            latest_episodes = await asyncio.gather(
+                *[self.check_rss(rss=feed) for feed in self.feeds], return_exceptions=True
+            )
+            failed = []
+            for feed, latest_episode in zip(self.feeds, latest_episodes):
+                if isinstance(latest_episode, EpisodeData):
+                    log.info('%s: Latest episode checked on bot power on: %s.', feed.title, latest_episode.number)
+                    continue
+                if isinstance(latest_episode, BaseException):
+                    log.error('%s: %s', feed.title, latest_episode)
                 else:
-                    raise RuntimeError(f"{feed.title}: No episode data found! Please check RSS Feed URL")
+                    log.error('%s: No episode data found! Please check RSS Feed URL', feed.title)
+                failed.append(feed.title)
+            if failed:
+                raise RuntimeError(f"Startup check failed for: {', '.join(failed)}")
 
     def startup_validate(self):
         """Check that configured channels are available"""
@@ -96,7 +223,7 @@ class RssWatcher(commands.Cog):
         for feed in self.feeds:
             # log.info(feed.channel_list)
             if feed.enabled is False:
-                log.info(f'{feed.title}: Is disabled, skipping.')
+                log.info('%s: Is disabled, skipping.', feed.title)
                 continue
             for index, (_announce_channel, _channel) in enumerate(
                 feed.get_channels(
@@ -106,18 +233,27 @@ class RssWatcher(commands.Cog):
             ):
                 channel = self.bot.get_channel(_channel)
                 if not channel:
-                    log.warning(f"{feed.title}-{index}: Channel (id={_channel}) not found!")
+                    log.warning("%s-%s: Channel (id=%s) not found!", feed.title, index, _channel)
                     continue
-                log.info(f"{feed.title}-{index}: Found channel (id={_channel}): {channel.guild.name}/{channel.name}")
+                log.info(
+                    "%s-%s: Found channel (id=%s): %s/%s", feed.title, index, _channel, channel.guild.name, channel.name
+                )
 
                 announce_channel = self.bot.get_channel(_announce_channel)
                 if announce_channel:
                     log.info(
-                        f"{feed.title}-{index}: Found announcement channel (id={_announce_channel}): {channel.guild.name}/{announce_channel.name}"
+                        "%s-%s: Found announcement channel (id=%s): %s/%s",
+                        feed.title,
+                        index,
+                        _announce_channel,
+                        channel.guild.name,
+                        announce_channel.name,
                     )
 
     def cog_unload(self):
         self.check_rss_feed.cancel()
+        if self._session is not None and not self._session.closed:
+            self.bot.loop.create_task(self._session.close())
 
     def get_embed(self, feed: RssFeedToChannel, latest_episode: EpisodeData, truncate: bool = False) -> Embed:
         """
@@ -126,14 +262,17 @@ class RssWatcher(commands.Cog):
         embed = Embed(
             title=latest_episode.get_title(prefix=feed.title_prefix, override_ep_number=feed.override_episode_numbers),
             description=latest_episode.get_description(truncate=truncate),
-            color=Color.from_rgb(*feed.get_color_theme()),
+            color=self._embed_colors[feed.title],
             url=latest_episode.episode_url,
             timestamp=latest_episode.get_timestamp(),
         )
-        embed.set_footer(text=f"Tags: {', '.join(latest_episode.tags)}")
+        if latest_episode.tags:
+            embed.set_footer(text=f"Tags: {', '.join(latest_episode.tags)}")
         # embed.set_thumbnail(url=latest_episode.channel_image_url)
         embed.set_author(name=latest_episode.channel_title, icon_url=latest_episode.channel_image_url)
-        embed.set_image(url=latest_episode.image_url)
+        # discord fetches the image itself, it is never downloaded by the bot
+        if latest_episode.image_url:
+            embed.set_image(url=latest_episode.image_url)
 
         return embed
 
@@ -145,20 +284,45 @@ class RssWatcher(commands.Cog):
             channel_title=channel_info.get(rss.rss_channel_title_key, ''),
         )
 
-    def _get_latest_episode_data(self, rss: RssFeedToChannel) -> EpisodeData:
-        """Gets the data for the latest episode"""
-        data = dict(feedparser.parse(rss.rss_feed))
+    async def _get_latest_episode_data(self, rss: RssFeedToChannel) -> EpisodeData | None:
+        """
+        Gets the data for the latest episode, returns None if the server
+        reports the feed has not changed since the last request.
+        """
+        session = await self.get_session()
+        async with session.get(rss.rss_feed, headers=rss.get_conditional_headers()) as resp:
+            if resp.status == 304:
+                log.debug('%s: Feed not modified.', rss.title)
+                return None
+            resp.raise_for_status()
+            raw = await resp.read()
+            # feedparser expects lowercase header names
+            response_headers = {key.lower(): value for key, value in resp.headers.items()}
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+
+        # not every server sends cache validators, an identical body is also unchanged
+        content_hash = hashlib.blake2b(raw, digest_size=16).digest()
+        if content_hash == rss.state.content_hash:
+            return None
 
-        channel_info = self._get_channel_info(rss, data.get('feed', {}))
-        latest_episode = data.get('entries', [])[rss.get_latest_episode_index_position()]
+        # parsing is CPU bound, keep it off the event loop. Only the newest entry
+        # is used unless the feed is backwards or episodes are numbered by count.
+        first_entry_only = not (rss.rss_feed_is_backwards or rss.override_episode_numbers)
+        data = await asyncio.to_thread(parse_feed, raw, first_entry_only, response_headers)
+
+        entries = data.get('entries', [])
+        latest_episode = entries[rss.get_latest_episode_index_position()]
 
         latest_ep_id = latest_episode.get(rss.rss_episode_key, 0)
         if rss.override_episode_numbers:
-            latest_ep_id = len(data.get('entries', []))
+            latest_ep_id = len(entries)
+        latest_ep_id = int(latest_ep_id)
 
+        channel_info = self._get_channel_info(rss, data.get('feed', {}))
         return_data = EpisodeData(
             number=latest_ep_id,
-            title=latest_episode.get(rss.rss_title_key, "None"),
+            title=latest_episode.get(rss.rss_title_key, "None").strip(),
             episode_url=latest_episode.get(rss.rss_episode_url_key, "None"),
             description=latest_episode.get(rss.rss_description_key, "None"),
             image_url=latest_episode.get(rss.rss_image_key, {}).get('href', ''),
@@ -168,6 +332,8 @@ class RssWatcher(commands.Cog):
             channel_last_published=channel_info.channel_last_published,
             channel_title=channel_info.channel_title,
         )
+        # only remembered once the episode was read, a feed that fails keeps failing instead of looking unchanged
+        rss.state.etag, rss.state.last_modified, rss.state.content_hash = etag, last_modified, content_hash
 
         return return_data
 
@@ -178,10 +344,12 @@ class RssWatcher(commands.Cog):
         embed: Embed,
         latest_episode_number: int,
         feed_title: str,
+        existing_threads: dict[str, Thread],
         override_episode_check: bool = False,
     ) -> Thread | None:
         """If the channel is a regular text channel, spawn a thread"""
-        if override_episode_check or not title in [thread.name for thread in channel.threads]:
+        existing_thread = existing_threads.get(title)
+        if override_episode_check or existing_thread is None:
             message = await channel.send(content=title, embed=embed, suppress=False)
 
             new_thread = await channel.create_thread(
@@ -194,15 +362,12 @@ class RssWatcher(commands.Cog):
             if (first_msg_in_thread := new_thread.starting_message) is not None:
                 await first_msg_in_thread.pin()
 
-            log.info(f"{feed_title}: Thread '{channel.guild.name}/{title}' created!")
+            log.info("%s: Thread '%s/%s' created!", feed_title, channel.guild.name, title)
+            existing_threads[title] = new_thread
             return new_thread
-        else:
-            log.info(f"{feed_title}: Thread '{channel.guild.name}/{title}' already exists, returning thread object.")
-            threads = [thread for thread in channel.threads if thread.name == title]
-            if len(threads) == 1:
-                return threads[0]
 
-        return None
+        log.info("%s: Thread '%s/%s' already exists, returning thread object.", feed_title, channel.guild.name, title)
+        return existing_thread
 
     async def add_forum_thread(
         self,
@@ -211,10 +376,12 @@ class RssWatcher(commands.Cog):
         embed: Embed,
         latest_episode_number: int,
         feed_title: str,
+        existing_threads: dict[str, Thread],
         override_episode_check: bool = False,
     ) -> Thread | None:
         """If the channel is a Forum, spawn a post (that is actually a thread)"""
-        if override_episode_check or not title in [thread.name for thread in channel.threads]:
+        existing_thread = existing_threads.get(title)
+        if override_episode_check or existing_thread is None:
             new_thread = await channel.create_thread(
                 name=title,
                 embed=embed,
@@ -226,15 +393,12 @@ class RssWatcher(commands.Cog):
             # if (first_msg_in_thread := new_thread.starting_message) is not None:
             #     await first_msg_in_thread.pin()
 
-            log.info(f"{feed_title}: Channel '{channel.guild.name}/{title}' created!")
+            log.info("%s: Channel '%s/%s' created!", feed_title, channel.guild.name, title)
+            existing_threads[title] = new_thread
             return new_thread
-        else:
-            log.info(f"{feed_title}: Thread '{channel.guild.name}/{title}' already exists, returning thread object.")
-            threads = [thread for thread in channel.threads if thread.name == title]
-            if len(threads) == 1:
-                return threads[0]
 
-        return None
+        log.info("%s: Thread '%s/%s' already exists, returning thread object.", feed_title, channel.guild.name, title)
+        return existing_thread
 
     async def create_announcement(
         self,
@@ -262,116 +426,170 @@ class RssWatcher(commands.Cog):
                 if last_announcement_message:
                     if announce_title in last_announcement_message.content:
                         log.info(
-                            f"{feed_title}: Announcement message already exists in channel '{announce_channel.guild.name}/{announce_channel.name}' (id={announce_channel}), skipping."
+                            "%s: Announcement message already exists in channel '%s/%s' (id=%s), skipping.",
+                            feed_title,
+                            announce_channel.guild.name,
+                            announce_channel.name,
+                            announce_channel,
                         )
                         return
 
             log.info(
-                f"{feed_title}: Sending announcement message to '{announce_channel.guild.name}/{announce_channel.name}' (id={announce_channel.id})"
+                "%s: Sending announcement message to '%s/%s' (id=%s)",
+                feed_title,
+                announce_channel.guild.name,
+                announce_channel.name,
+                announce_channel.id,
             )
             _announcement = await announce_channel.send(content=announce_message, embed=embed)
         else:
-            log.warning(f"{feed_title}: Configured announcement channel (id={announce_channel}) is not a TextChannel")
+            log.warning(
+                "%s: Configured announcement channel (id=%s) is not a TextChannel", feed_title, announce_channel
+            )
 
-    def check_rss(self, rss: RssFeedToChannel, episode_number_override: int | None = None) -> EpisodeData | None:
+    async def check_rss(self, rss: RssFeedToChannel, episode_number_override: int | None = None) -> EpisodeData | None:
         """
         If the latest episode is newer than the currently stored episode,
         return new episode
         """
-        current_episode = episode_number_override or rss.current_episode
+        current_episode = episode_number_override or rss.state.current_episode
 
-        latest_episode = self._get_latest_episode_data(rss)
+        latest_episode = await self._get_latest_episode_data(rss)
 
-        if latest_episode.number > current_episode:
-            rss.current_episode = latest_episode.number
+        if latest_episode is not None and latest_episode.number > current_episode:
+            rss.state.current_episode = latest_episode.number
             return latest_episode
         return None
 
+    async def _process_feed(self, feed: RssFeedToChannel, thread_indexes: dict[int, dict[str, Thread]]) -> bool | None:
+        """
+        Checks a single feed and posts a new thread/announcement if there is a new episode.
+        Thread name indexes are shared between all feeds checked in the same loop.
+
+        Returns whether there was a new episode, or None if checking the feed failed.
+        """
+        try:
+            if (latest_episode := await self.check_rss(rss=feed)) is not None:
+                log.info("%s: New episode found: %s", feed.title, latest_episode.number)
+
+                title = latest_episode.get_title(feed.title_prefix, feed.override_episode_prepend_title)
+                channel_embed = self.get_embed(feed, latest_episode)
+                # the announcement embed only differs by its shortened description
+                announce_embed = channel_embed.copy()
+                announce_embed.description = latest_episode.get_description(truncate=True)
+
+                thread = None
+                for index, (_announce_channel, _channel) in enumerate(
+                    feed.get_channels(
+                        settings.override_announce_channel_id,
+                        settings.override_channel_id,
+                    )
+                ):
+                    channel = self.bot.get_channel(_channel)
+                    if not channel:
+                        log.info("%s-%s: Channel (id=%s) not found! Skipping.", feed.title, index, _channel)
+                        continue
+                    log.info(
+                        "%s-%s: Found channel (id=%s): %s/%s",
+                        feed.title,
+                        index,
+                        _channel,
+                        channel.guild.name,
+                        channel.name,
+                    )
+
+                    announce_channel = self.bot.get_channel(_announce_channel)
+                    if announce_channel:
+                        log.info(
+                            "%s-%s: Found channel (id=%s): %s/%s",
+                            feed.title,
+                            index,
+                            _announce_channel,
+                            channel.guild.name,
+                            announce_channel.name,
+                        )
+
+                    if isinstance(channel, TextChannel):
+                        thread = await self.add_text_thread(
+                            channel=channel,
+                            title=title,
+                            embed=channel_embed,
+                            latest_episode_number=latest_episode.number,
+                            feed_title=feed.title,
+                            existing_threads=index_threads(channel, thread_indexes),
+                            override_episode_check=feed.override_episode_check,
+                        )
+
+                    elif isinstance(channel, ForumChannel):
+                        # If the channel is a Forum, spawn a post (that is actually a thread)
+                        thread = await self.add_forum_thread(
+                            channel=channel,
+                            title=title,
+                            embed=channel_embed,
+                            latest_episode_number=latest_episode.number,
+                            feed_title=feed.title,
+                            existing_threads=index_threads(channel, thread_indexes),
+                            override_episode_check=feed.override_episode_check,
+                        )
+
+                    if thread:
+                        await self.create_announcement(
+                            announce_channel=announce_channel,
+                            embed=announce_embed,
+                            feed_title=feed.title,
+                            announcement=title,
+                            message=thread,
+                        )
+
+                    # Add subscribers belonging to $ROLE to thread
+                    if (role := feed.subscriber_role_id) is not None:
+                        if members := thread.guild.get_role(role):
+                            for member in members.members:
+                                await thread.add_user(member)
+
+                return True
+            return False
+        except Exception as e:
+            feed.state.error_count += 1
+            log.critical('%s: %s', feed.title, e)
+            log.error(traceback.format_exc())
+            return None
+
     @tasks.loop(minutes=settings.check_interval_min)
     async def check_rss_feed(self):
         """Actual bot loop"""
         log.debug("Checking RSS feed...")
+        feeds = []
         for feed in self.feeds:
-            if feed.error_count > settings.error_count_disable:
+            if feed.state.error_count > settings.error_count_disable:
                 log.warning(
-                    f'{feed.title} has exceeded error count, skipping. To clear this counter restart the service.'
+                    '%s has exceeded error count, skipping. To clear this counter restart the service.', feed.title
                 )
-                continue
-            if feed.enabled is False:
-                log.debug(f'{feed.title}: Is disabled, skipping.')
-                continue
-
-            try:
-                if (latest_episode := self.check_rss(rss=feed)) is not None:
-                    log.info(f"{feed.title}: New episode found: {latest_episode.number}")
+            elif feed.enabled:
+                feeds.append(feed)
 
-                    title = latest_episode.get_title(feed.title_prefix, feed.override_episode_prepend_title)
-                    channel_embed = self.get_embed(feed, latest_episode)
-                    announce_embed = self.get_embed(feed, latest_episode, truncate=True)
-
-                    thread = None
-                    for index, (_announce_channel, _channel) in enumerate(
-                        feed.get_channels(
-                            settings.override_announce_channel_id,
-                            settings.override_channel_id,
-                        )
-                    ):
-                        channel = self.bot.get_channel(_channel)
-                        if not channel:
-                            log.info(f"{feed.title}-{index}: Channel (id={_channel}) not found! Skipping.")
-                            continue
-                        log.info(
-                            f"{feed.title}-{index}: Found channel (id={_channel}): {channel.guild.name}/{channel.name}"
-                        )
-
-                        announce_channel = self.bot.get_channel(_announce_channel)
-                        if announce_channel:
-                            log.info(
-                                f"{feed.title}-{index}: Found channel (id={_announce_channel}): {channel.guild.name}/{announce_channel.name}"
-                            )
-
-                        if isinstance(channel, TextChannel):
-                            thread = await self.add_text_thread(
-                                channel=channel,
-                                title=title,
-                                embed=channel_embed,
-                                latest_episode_number=latest_episode.number,
-                                feed_title=feed.title,
-                                override_episode_check=feed.override_episode_check,
-                            )
-
-                        elif isinstance(channel, ForumChannel):
-                            # If the channel is a Forum, spawn a post (that is actually a thread)
-                            thread = await self.add_forum_thread(
-                                channel=channel,
-                                title=title,
-                                embed=channel_embed,
-                                latest_episode_number=latest_episode.number,
-                                feed_title=feed.title,
-                                override_episode_check=feed.override_episode_check,
-                            )
-
-                        if thread:
-                            await self.create_announcement(
-                                announce_channel=announce_channel,
-                                embed=announce_embed,
-                                feed_title=feed.title,
-                                announcement=title,
-                                message=thread,
-                            )
-
-                        # Add subscribers belonging to $ROLE to thread
-                        if (role := feed.subscriber_role_id) is not None:
-                            if members := thread.guild.get_role(role):
-                                for member in members.members:
-                                    await thread.add_user(member)
+        thread_indexes: dict[int, dict[str, Thread]] = {}
+        # feeds are fetched concurrently, a slow feed no longer holds up the others
+        results = await asyncio.gather(
+            *[self._process_feed(feed, thread_indexes) for feed in feeds], return_exceptions=True
+        )
+        if no_updates := [feed.title for feed, result in zip(feeds, results) if result is False]:
+            log.debug('No updates: %s', ", ".join(no_updates))
 
-                else:
-                    log.debug(f'{feed.title}: No updates.')
-            except Exception as e:
-                feed.error_count += 1
-                log.critical(f'{feed.title}: {e}')
-                log.error(traceback.format_exc())
+    @check_rss_feed.before_loop
+    async def before_check_rss_feed(self):
+        """
+        Runs the startup check once before the first iteration, unlike on_ready
+        this does not fire again when the bot reconnects.
+        """
+        await self.bot.wait_until_ready()
+        try:
+            await self.startup_check()
+        except Exception as e:
+            log.critical('Shutting down: %s', e)
+            self.startup_error = e
+            await self.bot.close()
+            raise
 
 
 def setup(bot: Bot):
@@ -0,0 +1,6 @@
+from .discordbot import bot, settings
+
+bot.run(settings.token.get_secret_value())
+# a failed startup check closes the bot, exit with its error instead of cleanly
+if (rsswatcher := bot.get_cog('RssWatcher')) is not None and rsswatcher.startup_error is not None:
+    raise rsswatcher.startup_error
@@ -34,6 +34,9 @@ async def on_ready():
     try:
         rsswatcher = bot.get_cog('RssWatcher')
         if rsswatcher:
+            if rsswatcher.check_rss_feed.is_running():
+                # on_ready fires again after a reconnect, the loop is already going
+                return
             rsswatcher.startup_validate()
             log.info(
                 "\n".join(
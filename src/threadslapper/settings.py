@@ -1,29 +1,43 @@
 import logging
 import os
+import re
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from logging.handlers import TimedRotatingFileHandler
 from typing import Annotated, Any, Iterator, Literal, Tuple
 
-import yaml
-from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict, SecretStr
+from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict, PrivateAttr, SecretStr
 from pydantic_extra_types import color
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+TRUE_STRINGS = frozenset(['true', 't', 'yes', 'y', '1'])
+
 
 def prevalidate_boolean(v: Any) -> bool:
     """Evaluate 'true' strings to True, everything else to False"""
+    # yaml already gives bools, check for those first
+    if type(v) is bool:
+        return v
     if v is None:
         return False
-    if isinstance(v, str):
-        return v.lower() in ['true', 't', 'yes', 'y', '1']
+    if type(v) is str:
+        return v.lower() in TRUE_STRINGS
     return v
 
 
+QUOTATION_MARKS = re.compile(r'["\']')
+
+
+@lru_cache(maxsize=512)
 def validate_string(v: str) -> str:
-    """Remove unwanted whitespace and check for quotation marks"""
+    """
+    Remove unwanted whitespace and check for quotation marks, feeds share most of
+    their key names so the result is cached.
+    """
     v = v.strip()
-    assert '"' not in v, "Quotation symbol `\"` detected, please remove."
-    assert "'" not in v, "Quotation symbol `\'` detected, please remove."
+    if (match := QUOTATION_MARKS.search(v)) is not None:
+        raise AssertionError(f"Quotation symbol `{match.group()}` detected, please remove.")
     return v
 
 
@@ -31,17 +45,17 @@ def validate_secretstr(v: SecretStr) -> SecretStr:
     """Remove unwanted whitespace and check for quotation marks"""
     _v = v.get_secret_value()
     _v = _v.strip()
-    if '"' in _v:
-        raise AssertionError("Quotation symbol `\"` detected, please remove.")
-    if "'" in _v:
-        raise AssertionError("Quotation symbol `\"` detected, please remove.")
+    if (match := QUOTATION_MARKS.search(_v)) is not None:
+        raise AssertionError(f"Quotation symbol `{match.group()}` detected, please remove.")
     if " # " in _v:
         raise AssertionError("A comment has somehow appeared in this key, please remove.")
     return SecretStr(_v)
 
 
 def validate_rss_feed(v: str) -> str:
-    assert v.strip() != "", "RSS Feed can not be blank!"
+    """validate_string, plus the feed url can not be blank"""
+    v = validate_string(v)
+    assert v != "", "RSS Feed can not be blank!"
     return v
 
 
@@ -50,12 +64,18 @@ def validate_channel_id(v: int) -> int:
     return v
 
 
+def is_unset_channel(v: Any) -> bool:
+    """No channel id given, -1 (or any id <= 0) is used in configs to mean no channel"""
+    return v is None or (isinstance(v, int) and v <= 0)
+
+
 def validate_color(v: int) -> int:
-    return max(min(255, v), 0)
+    return 0 if v < 0 else 255 if v > 255 else v
 
 
 def validate_nonnegative(v: int) -> int:
-    return abs(v)
+    """Negative values are clamped to 0"""
+    return v if v >= 0 else 0
 
 
 def prevalidate_blank_string(v: Any) -> int | None:
@@ -67,15 +87,94 @@ def prevalidate_blank_string(v: Any) -> int | None:
     return None
 
 
+CHANNEL_LIST_KEYS = frozenset(['channel', 'announce_channel'])
+
+
 def validate_channel_list(v: list[dict[str, int]]) -> list[dict[str, int]]:
+    """Entries may list the keys in any order, a missing key defaults to -1 in get_channels"""
     for el in v:
-        assert list(el.keys()) == ["channel", "announce_channel"]
+        assert el.keys() <= CHANNEL_LIST_KEYS, f"Unknown channel_list keys: {sorted(el.keys() - CHANNEL_LIST_KEYS)}"
     return v
 
 
+LOG_FORMATTER = logging.Formatter(
+    '%(asctime)s - [%(levelname)s] [ln: %(lineno)d] (%(process)d) - %(message)s',
+    "%Y-%m-%d %H:%M:%S %z",
+)
+# yaml only keys that are passed on to RssFeedToChannel as is, when set
+OPTIONAL_FEED_KEYS = (
+    'rss_episode_key',
+    'rss_title_key',
+    'rss_description_key',
+    'rss_image_key',
+    'rss_tag_key',
+    'rss_channel_title_key',
+    'rss_channel_url_key',
+    'rss_channel_image_key',
+    'rss_channel_last_published_key',
+    'color_theme_r',
+    'color_theme_g',
+    'color_theme_b',
+    'rss_feed_is_backwards',
+    'channel_list',
+)
+
+# fields model_construct would otherwise leave un-normalized, see normalize_trusted
+TRUSTED_BOOL_KEYS = frozenset(
+    [
+        'enabled',
+        'override_episode_numbers',
+        'override_episode_check',
+        'override_episode_prepend_title',
+        'rss_feed_is_backwards',
+    ]
+)
+TRUSTED_COLOR_KEYS = frozenset(['color_theme_r', 'color_theme_g', 'color_theme_b'])
+
+
+def normalize_trusted(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """
+    model_construct runs no validators, this keeps the cheap normalizing ones for
+    trusted configs: booleans, stripped strings and clamped colors. Quotation marks,
+    channel ids and value types are not checked.
+    """
+    for key, value in kwargs.items():
+        if key in TRUSTED_BOOL_KEYS:
+            kwargs[key] = bool(prevalidate_boolean(value))
+        elif key in TRUSTED_COLOR_KEYS:
+            kwargs[key] = validate_color(value)
+        elif isinstance(value, str):
+            kwargs[key] = value.strip()
+    return kwargs
+
+
+def _make_rotating(path: str, level: int) -> logging.Handler:
+    """Weekly rotating log file with the shared formatter"""
+    handler = TimedRotatingFileHandler(filename=path, when='W0', backupCount=10)
+    handler.setLevel(level)
+    handler.setFormatter(LOG_FORMATTER)
+    return handler
+
+
+# handlers per log path, see Settings.create_logger
+LOG_HANDLERS: dict[str, list[logging.Handler]] = {}
+
+
+@dataclass(slots=True)
+class FeedState:
+    """State of a feed that is set by the script while it runs"""
+
+    current_episode: int = 0
+    error_count: int = 0
+    # cache validators from the last feed response
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: bytes | None = None
+
+
 class RssFeedToChannel(BaseModel):
-    model_config = ConfigDict(str_strip_whitespace=True)
-    error_count: Annotated[int, AfterValidator(validate_nonnegative)] = 0  # this is set by the script
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra='forbid')
+    _state: FeedState = PrivateAttr(default_factory=FeedState)
 
     enabled: Annotated[bool, BeforeValidator(prevalidate_boolean)] = True
     title_prefix: Annotated[str, AfterValidator(validate_string)] = ""
@@ -84,7 +183,7 @@ class RssFeedToChannel(BaseModel):
     subscriber_role_id: int | None = None
     announce_channel_id: Annotated[int, AfterValidator(validate_channel_id)] = -1
     channel_list: Annotated[list[dict[str, int]], AfterValidator(validate_channel_list)] = []
-    rss_feed: Annotated[str, AfterValidator(validate_string), AfterValidator(validate_rss_feed)] = ""
+    rss_feed: Annotated[str, AfterValidator(validate_rss_feed)] = ""
     color_theme_r: Annotated[int, AfterValidator(validate_color)] = 0
     color_theme_g: Annotated[int, AfterValidator(validate_color)] = 0
     color_theme_b: Annotated[int, AfterValidator(validate_color)] = 0
@@ -106,12 +205,28 @@ class RssFeedToChannel(BaseModel):
     override_episode_numbers: Annotated[bool, BeforeValidator(prevalidate_boolean)] = False
     override_episode_check: Annotated[bool, BeforeValidator(prevalidate_boolean)] = False
     override_episode_prepend_title: Annotated[bool, BeforeValidator(prevalidate_boolean)] = False
-    current_episode: int = 0
     rss_feed_is_backwards: Annotated[bool, BeforeValidator(prevalidate_boolean)] = False
 
+    @property
+    def state(self) -> FeedState:
+        """The config is frozen, everything that changes at runtime lives here"""
+        return self._state
+
     def get_color_theme(self) -> Tuple[int, int, int]:
         return (self.color_theme_r, self.color_theme_g, self.color_theme_b)
 
+    def get_conditional_headers(self) -> dict[str, str]:
+        """
+        Request headers that let the server answer 304 Not Modified if the
+        feed has not changed since it was last fetched.
+        """
+        headers = {}
+        if self._state.etag:
+            headers['If-None-Match'] = self._state.etag
+        if self._state.last_modified:
+            headers['If-Modified-Since'] = self._state.last_modified
+        return headers
+
     def get_latest_episode_index_position(self) -> int:
         """
         Gets the index where the latest episode is, this is either -1
@@ -139,6 +254,7 @@ class Settings(BaseSettings):
         env_prefix="threadslapper_",
         env_nested_delimiter="__",
         env_file=".env",
+        frozen=True,
     )
 
     token: Annotated[SecretStr, AfterValidator(validate_secretstr)] = SecretStr("foo")
@@ -147,6 +263,8 @@ class Settings(BaseSettings):
     config_path: Annotated[str, AfterValidator(validate_string)] = "config/"
     config_file: Annotated[str, AfterValidator(validate_string)] = "example_config.yml"
     startup_latest_episode_check: bool = True  # check for latest episodes on power on
+    # skip validating the feeds in the config file, only use this for a config you control
+    trusted_config: Annotated[bool, BeforeValidator(prevalidate_boolean)] = False
 
     # how many errors does it take to disable an individiual feed?
     error_count_disable: Annotated[int, AfterValidator(validate_nonnegative)] = 3
@@ -164,117 +282,108 @@ class Settings(BaseSettings):
 
     debug: Annotated[bool, BeforeValidator(prevalidate_boolean)] = False
 
+    # parsed feeds and the modification time of the config file they were parsed from
+    _channels: tuple[float | None, list[RssFeedToChannel]] | None = PrivateAttr(default=None)
+    # paths derived from the fields above, see model_post_init
+    _config_file_path: str = PrivateAttr(default='')
+    _log_file_paths: tuple[str, str, str] = PrivateAttr(default=('', '', ''))
+
+    def model_post_init(self, __context: Any) -> None:
+        self._config_file_path = os.path.join(self.config_path, self.config_file)
+        self._log_file_paths = (
+            os.path.join(self.log_path, 'discordbot.log'),
+            os.path.join(self.log_path, 'discordbot_debug.log'),
+            os.path.join(self.log_path, 'discordbot_errors.log'),
+        )
+
     def create_logger(self, name: str) -> logging.Logger:
         log = logging.getLogger(name)
+        if log.handlers:
+            # already set up, adding the handlers again would write every line twice
+            return log
         log.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(
-            '%(asctime)s - [%(levelname)s] [ln: %(lineno)d] (%(process)d) - %(message)s',
-            "%Y-%m-%d %H:%M:%S %z",
-        )
-        stdout = logging.StreamHandler(sys.stdout)
-        stdout.setLevel(logging.INFO)
-        stdout.setFormatter(formatter)
-        file = TimedRotatingFileHandler(
-            filename=os.path.join(self.log_path, f'discordbot.log'),
-            when='W0',
-            backupCount=10,
-        )
-        file.setLevel(logging.INFO)
-        file.setFormatter(formatter)
-        fileDebug = TimedRotatingFileHandler(
-            filename=os.path.join(self.log_path, f'discordbot_debug.log'),
-            when='W0',
-            backupCount=10,
-        )
-        fileDebug.setLevel(logging.DEBUG)
-        fileDebug.setFormatter(formatter)
-        fileError = TimedRotatingFileHandler(
-            filename=os.path.join(self.log_path, f'discordbot_errors.log'),
-            when='W0',
-            backupCount=10,
-        )
-        fileError.setLevel(logging.WARNING)
-        fileError.setFormatter(formatter)
-        log.addHandler(stdout)
-        log.addHandler(file)
-        log.addHandler(fileDebug)
-        log.addHandler(fileError)
+        log.propagate = False
+
+        # loggers writing to the same log path share one set of handlers
+        if (handlers := LOG_HANDLERS.get(self.log_path)) is None:
+            stdout = logging.StreamHandler(sys.stdout)
+            stdout.setLevel(logging.INFO)
+            stdout.setFormatter(LOG_FORMATTER)
+            file_path, debug_path, error_path = self._log_file_paths
+            file = _make_rotating(file_path, logging.INFO)
+            fileDebug = _make_rotating(debug_path, logging.DEBUG)
+            fileError = _make_rotating(error_path, logging.WARNING)
+            handlers = LOG_HANDLERS[self.log_path] = [stdout, file, fileDebug, fileError]
+
+        for handler in handlers:
+            log.addHandler(handler)
 
         return log
 
     def get_channels_list(self) -> list[RssFeedToChannel]:
         """
-        Parses the config yaml file.
+        Parses the config yaml file, the result is kept until the file is modified.
         """
+        config_file = self._config_file_path
+        try:
+            # one stat call both checks the file exists and gets its modification time
+            mtime: float | None = os.stat(config_file).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if self._channels is not None and self._channels[0] == mtime:
+            return self._channels[1]
+
         obj = {}
-        config_file = os.path.join(self.config_path, self.config_file)
-        if os.path.exists(config_file):
+        if mtime is not None:
+            # yaml is only imported once there is a config file to read
+            import yaml
+
+            try:
+                # libyaml backed loader, much faster than the pure python one
+                from yaml import CSafeLoader as SafeLoader
+            except ImportError:
+                from yaml import SafeLoader  # type: ignore[assignment]
+
             with open(config_file, mode='r') as f:
-                obj = yaml.safe_load(f)
+                obj = yaml.load(f, Loader=SafeLoader)
 
         feeds: list[RssFeedToChannel] = []
-        try:
-            if self.channel:
-                feeds.append(self.channel)
-
-            for key, value in obj.items():
-                rss = RssFeedToChannel(
-                    enabled=value.get('enabled', True),
-                    title=key,
-                    title_prefix=value.get('title_prefix', ''),
-                    subscriber_role_id=value.get('subscriber_role_id', None),
-                    rss_feed=value.get('rss_url', ''),
-                    override_episode_numbers=value.get('override_episode_numbers', False),
-                    override_episode_check=value.get('override_episode_check', False),
-                    override_episode_prepend_title=value.get('override_episode_prepend_title', False),
-                )
-
-                channel = value.get('channel_id', -1)
-                announce_channel = value.get('announce_channel_id', None)
-                rss.announce_channel_id = announce_channel
-
-                if isinstance(channel, int):
-                    rss.channel_id = channel
-                elif isinstance(channel, list):
-                    rss.hybrid_channel_list = [
-                        (pair.get('channel', None), pair.get('announce_channel', None)) for pair in channel
-                    ]
-
-                if (rss_key := value.get('rss_episode_key', None)) is not None:
-                    rss.rss_episode_key = rss_key
-                if (rss_key := value.get('rss_title_key', None)) is not None:
-                    rss.rss_title_key = rss_key
-                if (rss_key := value.get('rss_description_key', None)) is not None:
-                    rss.rss_description_key = rss_key
-                if (rss_key := value.get('rss_image_key', None)) is not None:
-                    rss.rss_image_key = rss_key
-                if (rss_key := value.get('rss_tag_key', None)) is not None:
-                    rss.rss_tag_key = rss_key
-
-                if (rss_key := value.get('rss_channel_title_key', None)) is not None:
-                    rss.rss_channel_title_key = rss_key
-                if (rss_key := value.get('rss_channel_url_key', None)) is not None:
-                    rss.rss_channel_url_key = rss_key
-                if (rss_key := value.get('rss_channel_image_key', None)) is not None:
-                    rss.rss_channel_image_key = rss_key
-                if (rss_key := value.get('rss_channel_last_published_key', None)) is not None:
-                    rss.rss_channel_last_published_key = rss_key
-
-                if (rss_key := value.get('color_theme_r', None)) is not None:
-                    rss.color_theme_r = rss_key
-                if (rss_key := value.get('color_theme_g', None)) is not None:
-                    rss.color_theme_g = rss_key
-                if (rss_key := value.get('color_theme_b', None)) is not None:
-                    rss.color_theme_b = rss_key
-
-                if (rss_key := value.get('rss_feed_is_backwards', None)) is not None:
-                    rss.rss_feed_is_backwards = rss_key
-
-                if (rss_key := value.get('channel_list', None)) is not None:
-                    rss.channel_list = rss_key
-
-                feeds.append(rss)
-        except Exception as e:
-            logging.getLogger(__name__).error(e)
-
+        if self.channel:
+            feeds.append(self.channel)
+
+        for key, value in obj.items():
+            kwargs = {
+                'enabled': value.get('enabled', True),
+                'title': key,
+                'title_prefix': value.get('title_prefix', ''),
+                'subscriber_role_id': value.get('subscriber_role_id', None),
+                'rss_feed': value.get('rss_url', ''),
+                'override_episode_numbers': value.get('override_episode_numbers', False),
+                'override_episode_check': value.get('override_episode_check', False),
+                'override_episode_prepend_title': value.get('override_episode_prepend_title', False),
+            }
+            kwargs.update((k, rss_key) for k in OPTIONAL_FEED_KEYS if (rss_key := value.get(k, None)) is not None)
+
+            channel = value.get('channel_id', None)
+            if isinstance(channel, list):
+                # a list of channel/announce_channel pairs is the same as `channel_list`
+                kwargs.setdefault('channel_list', channel)
+            elif not is_unset_channel(channel):
+                kwargs['channel_id'] = channel
+            if not is_unset_channel(announce_channel := value.get('announce_channel_id', None)):
+                kwargs['announce_channel_id'] = announce_channel
+
+            try:
+                if self.trusted_config:
+                    # model_construct skips validation, the yaml values are only normalized
+                    rss = RssFeedToChannel.model_construct(**normalize_trusted(kwargs))
+                else:
+                    rss = RssFeedToChannel(**kwargs)
+            except Exception as e:
+                # a bad feed is skipped, the others still load
+                self.create_logger(__name__).error('%s: skipping feed, %s', key, e)
+                continue
+            feeds.append(rss)
+
+        self._channels = (mtime, feeds)
         return feeds
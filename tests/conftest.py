@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# the cog and settings modules create their loggers on import, keep the log files out of the repo
+os.environ.setdefault('THREADSLAPPER_LOG_PATH', tempfile.mkdtemp(prefix='threadslapper-tests-'))
@@ -0,0 +1,272 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from aiohttp import web
+
+from cogs import RssWatcher
+from cogs.RssWatcher import index_threads, md_summary, parse_feed, parse_timestamp, trim_to_first_entry
+from threadslapper.settings import RssFeedToChannel
+
+RSS = b'''<?xml version="1.0"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel>
+<title>Pod</title><link>http://pod</link>
+<item><title>Ep 3</title><itunes:episode>3</itunes:episode></item>
+<item><title>Ep 2</title><itunes:episode>2</itunes:episode></item>
+<item><title>Ep 1</title><itunes:episode>1</itunes:episode></item>
+</channel></rss>'''
+
+ATOM = b'''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Blog</title>
+<entry><title>Post 2</title><id>2</id></entry>
+<entry><title>Post 1</title><id>1</id></entry>
+</feed>'''
+
+
+def test_trim_rss_keeps_first_item():
+    trimmed = trim_to_first_entry(RSS)
+    assert b'Ep 3' in trimmed
+    assert b'Ep 2' not in trimmed
+    assert trimmed.endswith(b'</channel></rss>')
+
+
+def test_trim_atom_keeps_first_entry():
+    trimmed = trim_to_first_entry(ATOM)
+    assert b'Post 2' in trimmed
+    assert b'Post 1' not in trimmed
+    assert trimmed.endswith(b'</feed>')
+
+
+@pytest.mark.parametrize('raw', [b'<rss><channel><title>Empty</title></channel></rss>', RSS.split(b'<item>')[0]])
+def test_trim_without_second_entry_is_unchanged(raw):
+    assert trim_to_first_entry(raw) == raw
+
+
+def test_parse_feed_first_entry_only():
+    data = parse_feed(RSS, first_entry_only=True)
+    assert [entry['title'] for entry in data['entries']] == ['Ep 3']
+    assert data['feed']['title'] == 'Pod'
+
+    data = parse_feed(ATOM, first_entry_only=True)
+    assert [entry['title'] for entry in data['entries']] == ['Post 2']
+
+
+def test_parse_feed_full_document():
+    assert [entry['title'] for entry in parse_feed(RSS)['entries']] == ['Ep 3', 'Ep 2', 'Ep 1']
+
+
+def test_parse_feed_falls_back_to_full_document(monkeypatch):
+    # a trimmed document without entries, e.g. the cut landed somewhere unexpected
+    monkeypatch.setattr(RssWatcher, 'trim_to_first_entry', lambda raw: raw.split(b'<item>')[0] + b'</channel></rss>')
+    data = parse_feed(RSS, first_entry_only=True)
+    assert [entry['title'] for entry in data['entries']] == ['Ep 3', 'Ep 2', 'Ep 1']
+
+
+@pytest.mark.parametrize(
+    'timestamp,expected',
+    [
+        ('Tue, 10 Oct 2023 10:00:00 GMT', datetime(2023, 10, 10, 10, 0, tzinfo=timezone.utc)),
+        ('Tue, 10 Oct 2023 12:00:00 +0200', datetime(2023, 10, 10, 10, 0, tzinfo=timezone.utc)),
+        ('2023-10-10T10:00:00+00:00', datetime(2023, 10, 10, 10, 0, tzinfo=timezone.utc)),
+        ('2023-10-10T10:00:00Z', datetime(2023, 10, 10, 10, 0, tzinfo=timezone.utc)),
+    ],
+)
+def test_parse_timestamp(timestamp, expected):
+    assert parse_timestamp(timestamp) == expected
+
+
+@pytest.mark.parametrize('timestamp', ['', 'not a date', 'yesterday'])
+def test_parse_timestamp_unrecognised(timestamp):
+    assert parse_timestamp(timestamp) is None
+
+
+def make_feed(*episodes: int) -> bytes:
+    items = b''.join(b'<item><title>Ep %d</title><itunes:episode>%d</itunes:episode></item>' % (e, e) for e in episodes)
+    return RSS.split(b'<item>')[0] + items + b'</channel></rss>'
+
+
+class FeedServer:
+    """Serves `body` on a local port, records the request headers of every hit"""
+
+    def __init__(self, body: bytes, etag: str | None = None):
+        self.body = body
+        self.etag = etag
+        self.requests: list[dict[str, str]] = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.headers))
+        if self.etag is not None and request.headers.get('If-None-Match') == self.etag:
+            return web.Response(status=304)
+        headers = {'ETag': self.etag} if self.etag is not None else {}
+        return web.Response(body=self.body, headers=headers, content_type='application/rss+xml')
+
+    async def run(self, polls):
+        """Starts the server and awaits polls(watcher, feed)"""
+        app = web.Application()
+        app.router.add_get('/feed', self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        watcher = RssWatcher.RssWatcher(bot=None)
+        feed = RssFeedToChannel(title='test', rss_feed=f'http://127.0.0.1:{port}/feed')
+        try:
+            return await polls(watcher, feed)
+        finally:
+            await (await watcher.get_session()).close()
+            await runner.cleanup()
+
+
+def test_check_rss_not_modified():
+    server = FeedServer(make_feed(2, 1), etag='"v1"')
+
+    async def polls(watcher, feed):
+        return [await watcher.check_rss(feed), await watcher.check_rss(feed)]
+
+    first, second = asyncio.run(server.run(polls))
+    assert first.number == 2
+    assert second is None
+    assert 'If-None-Match' not in server.requests[0]
+    assert server.requests[1]['If-None-Match'] == '"v1"'
+
+
+def test_check_rss_keeps_etag_of_broken_feed_unused():
+    server = FeedServer(make_feed(2, 1).replace(b'<itunes:episode>2<', b'<itunes:episode>x<'), etag='"v1"')
+
+    async def polls(watcher, feed):
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await watcher.check_rss(feed)
+        return feed.state
+
+    state = asyncio.run(server.run(polls))
+    # the entry could not be read, so the next poll must not be answered with a 304
+    assert all('If-None-Match' not in headers for headers in server.requests)
+    assert state.etag is None
+
+
+def test_check_rss_content_hash():
+    # no ETag, only the body hash tells an unchanged feed apart
+    server = FeedServer(make_feed(2, 1))
+
+    async def polls(watcher, feed):
+        results = [await watcher.check_rss(feed), await watcher.check_rss(feed)]
+        server.body = make_feed(3, 2, 1)
+        results.append(await watcher.check_rss(feed))
+        return results
+
+    first, unchanged, new = asyncio.run(server.run(polls))
+    assert first.number == 2
+    assert unchanged is None
+    assert new.number == 3
+
+
+def test_check_rss_broken_feed_keeps_failing():
+    server = FeedServer(make_feed())
+
+    async def polls(watcher, feed):
+        for _ in range(2):
+            # no entries, reading the latest one fails on every poll
+            with pytest.raises(IndexError):
+                await watcher.check_rss(feed)
+        return feed.state
+
+    state = asyncio.run(server.run(polls))
+    assert state.content_hash is None
+
+
+def test_startup_check_reports_every_failed_feed():
+    server = FeedServer(make_feed(2, 1))
+
+    async def polls(watcher, feed):
+        missing = RssFeedToChannel(title='missing', rss_feed=feed.rss_feed.replace('/feed', '/missing'))
+        broken = RssFeedToChannel(title='broken', rss_feed=feed.rss_feed, rss_episode_key='title')
+        watcher.feeds = [missing, feed, broken]
+        with pytest.raises(RuntimeError) as e:
+            await watcher.startup_check()
+        return str(e.value), feed.state.current_episode
+
+    error, current_episode = asyncio.run(server.run(polls))
+    # the failing feeds do not cancel each other or the working one
+    assert error == 'Startup check failed for: missing, broken'
+    assert current_episode == 2
+
+
+class FakeThread:
+    def __init__(self, name: str):
+        self.name = name
+
+    async def join(self):
+        pass
+
+
+class FakeForum:
+    """Stands in for a ForumChannel, counts how often its threads are listed"""
+
+    def __init__(self, id: int, thread_names: list[str]):
+        self.id = id
+        self.guild = type('Guild', (), {'name': 'guild'})()
+        self._threads = [FakeThread(name) for name in thread_names]
+        self.listed = 0
+        self.created: list[str] = []
+
+    @property
+    def threads(self):
+        self.listed += 1
+        return list(self._threads)
+
+    async def create_thread(self, name: str, **kwargs):
+        self.created.append(name)
+        thread = FakeThread(name)
+        self._threads.append(thread)
+        return thread
+
+
+def test_index_threads_is_built_once_per_channel():
+    forum, other = FakeForum(1, ['Ep 1']), FakeForum(2, [])
+    indexes = {}
+    assert index_threads(forum, indexes) is index_threads(forum, indexes)
+    assert list(index_threads(forum, indexes)) == ['Ep 1']
+    assert index_threads(other, indexes) == {}
+    assert forum.listed == 1
+    assert other.listed == 1
+
+
+def test_shared_thread_index_sees_new_threads():
+    forum = FakeForum(1, ['Ep 1'])
+    watcher = RssWatcher.RssWatcher(bot=None)
+    indexes = {}
+
+    async def post(title):
+        return await watcher.add_forum_thread(
+            channel=forum,
+            title=title,
+            embed=None,
+            latest_episode_number=2,
+            feed_title='test',
+            existing_threads=index_threads(forum, indexes),
+        )
+
+    async def posts():
+        # two feeds announcing the same episode to one channel during a single check
+        return [await post('Ep 1'), await post('Ep 2'), await post('Ep 2')]
+
+    existing, created, again = asyncio.run(posts())
+    assert existing.name == 'Ep 1'
+    assert created is again
+    assert forum.created == ['Ep 2']
+    assert forum.listed == 1
+
+
+@pytest.mark.parametrize(
+    'html',
+    [
+        '<p>First <b>para</b></p><p>Second</p>',
+        'First <b>para</b><br><br>Second',
+        'First <b>para</b><BR/> <br>Second',
+        '<p>First <b>para</b>',
+    ],
+)
+def test_md_summary(html):
+    assert md_summary(html) == 'First **para**'
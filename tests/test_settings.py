@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from threadslapper.settings import Settings, normalize_trusted
+
+CONFIG = '''
+a:
+  rss_url: http://a
+  channel_id: 1
+'''
+
+
+@pytest.fixture
+def config(tmp_path):
+    (tmp_path / 'config.yml').write_text(CONFIG)
+    return tmp_path
+
+
+def test_get_channels_list_is_cached_until_modified(config):
+    settings = Settings(config_path=str(config), config_file='config.yml')
+    feeds = settings.get_channels_list()
+    assert [feed.title for feed in feeds] == ['a']
+    assert settings.get_channels_list() is feeds
+
+    (config / 'config.yml').write_text('d:\n  rss_url: http://d\n')
+    # make sure the modification time changes even on coarse filesystems
+    stat = (config / 'config.yml').stat()
+    os.utime(config / 'config.yml', (stat.st_atime, stat.st_mtime + 10))
+    assert [feed.title for feed in settings.get_channels_list()] == ['d']
+
+
+def test_get_channels_list_missing_file(tmp_path):
+    assert Settings(config_path=str(tmp_path), config_file='missing.yml').get_channels_list() == []
+
+
+FEEDS = '''
+a:
+  rss_url: http://a
+  title_prefix: "  A  "
+  channel_id: -1
+  channel_list:
+    - announce_channel: 2
+      channel: 1
+    - channel: 3
+b:
+  rss_url: http://b
+  channel_id: 5
+  announce_channel_id: -1
+  color_theme_r: 300
+c:
+  rss_url: ""
+'''
+
+
+@pytest.fixture
+def feeds_config(tmp_path):
+    (tmp_path / 'config.yml').write_text(FEEDS)
+    return tmp_path
+
+
+def test_get_channels_list(feeds_config):
+    feeds = Settings(config_path=str(feeds_config), config_file='config.yml').get_channels_list()
+
+    # c has a blank rss url, it is skipped without dropping the others
+    assert [feed.title for feed in feeds] == ['a', 'b']
+    a, b = feeds
+    assert a.title_prefix == 'A'
+    # channel_list keys may come in any order, -1 channel ids mean no channel
+    assert a.get_channels() == [(2, 1), (-1, 3)]
+    assert b.get_channels() == [(-1, 5)]
+    assert b.get_color_theme() == (255, 0, 0)
+
+
+def test_get_channels_list_trusted(feeds_config):
+    feeds = Settings(config_path=str(feeds_config), config_file='config.yml', trusted_config=True).get_channels_list()
+
+    # nothing is validated, but strings, booleans and colors are still normalized
+    assert [feed.title for feed in feeds] == ['a', 'b', 'c']
+    assert feeds[0].title_prefix == 'A'
+    assert feeds[0].enabled is True
+    assert feeds[1].get_color_theme() == (255, 0, 0)
+
+
+def test_normalize_trusted():
+    assert normalize_trusted(
+        {'enabled': 'false', 'rss_feed_is_backwards': 'yes', 'title': ' t ', 'color_theme_g': -4}
+    ) == {
+        'enabled': False,
+        'rss_feed_is_backwards': True,
+        'title': 't',
+        'color_theme_g': 0,
+    }